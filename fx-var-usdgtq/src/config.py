@@ -17,21 +17,36 @@ SOAP_TIMEOUT_SECONDS = 300
 SOAP_MAX_RETRIES = 8
 SOAP_BACKOFF_BASE_SECONDS = 2
 SOAP_BACKOFF_MAX_SECONDS = 120
+SOAP_MAX_WORKERS = 8
 DEFAULT_NOTIONAL_USD = 10000.0
 FEATURE_LAGS = (1, 5, 10, 20, 60)
 DEFAULT_TEST_DAYS = 250
 VAR_QUANTILE = 0.01
 MODEL_RANDOM_STATE = 42
 
-DEFAULT_RAW_FILE = RAW_DIR / "usd_gtq_daily.csv"
+DEFAULT_RAW_FILE = RAW_DIR / "usd_gtq_daily.parquet"
 RAW_METADATA_FILE = RAW_DIR / "usd_gtq_daily.metadata.json"
+SOAP_CACHE_DIR = EXTERNAL_DIR / "soap_cache"
 DEFAULT_PROCESSED_FILE = PROCESSED_DIR / "fx_rates.parquet"
 DEFAULT_FEATURES_FILE = PROCESSED_DIR / "features.parquet"
 MODEL_DIR = PROCESSED_DIR / "models"
+MODEL_BUNDLE_NAME = "stage4_models.joblib"
 PREDICTIONS_FILE = REPORTS_DIR / "fx-var_usdgtq_predictions.csv"
 
 
 def ensure_directories() -> None:
     """Create required project directories deterministically."""
-    for path in (RAW_DIR, PROCESSED_DIR, EXTERNAL_DIR, REPORTS_DIR, FIGURES_DIR):
+    for path in (
+        RAW_DIR,
+        PROCESSED_DIR,
+        MODEL_DIR,
+        EXTERNAL_DIR,
+        REPORTS_DIR,
+        FIGURES_DIR,
+    ):
         path.mkdir(parents=True, exist_ok=True)
+
+
+def ensure_parent_dir(path: Path) -> None:
+    """Create the parent directory of ``path`` if it does not exist."""
+    path.parent.mkdir(parents=True, exist_ok=True)
@@ -4,11 +4,25 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import bottleneck as bn
+except ImportError:  # pragma: no cover - optional accelerator
+    bn = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional accelerator
+    njit = None
 
 from src.config import DEFAULT_NOTIONAL_USD, DEFAULT_TEST_DAYS, FEATURE_LAGS
 
 REQUIRED_INPUT_COLUMNS = ["date", "rate"]
 TARGET_COLUMN = "pnl_next_day"
+# Return, return-lag and rolling columns are stored in single precision;
+# PnL columns stay float64 so notional amounts remain exact.
+RETURN_FEATURE_DTYPE = np.float32
 
 
 def _validate_input_columns(df: pd.DataFrame) -> None:
@@ -26,6 +40,106 @@ def _validate_lags(lags: tuple[int, ...]) -> tuple[int, ...]:
     return tuple(sorted(set(lags)))
 
 
+def _lagged_views(values: np.ndarray, lags: tuple[int, ...]) -> dict[int, np.ndarray]:
+    size = len(values)
+    max_lag = max(lags)
+    padded = np.concatenate([np.full(max_lag, np.nan, dtype=values.dtype), values])
+    return {lag: padded[max_lag - lag : max_lag - lag + size] for lag in lags}
+
+
+def _rolling_windows(values: np.ndarray, window: int) -> np.ndarray | None:
+    if window > len(values):
+        return None
+    return sliding_window_view(values, window)
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    if bn is not None and window <= len(values):
+        return bn.move_mean(values, window=window, min_count=window)
+    out = np.full(len(values), np.nan)
+    windows = _rolling_windows(values, window)
+    if windows is not None:
+        out[window - 1 :] = windows.mean(axis=-1)
+    return out
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    if bn is not None and window <= len(values):
+        return bn.move_std(values, window=window, min_count=window, ddof=0)
+    out = np.full(len(values), np.nan)
+    windows = _rolling_windows(values, window)
+    if windows is not None:
+        out[window - 1 :] = windows.std(axis=-1, ddof=0)
+    return out
+
+
+def _fused_feature_kernel(
+    rates: np.ndarray,
+    lags: np.ndarray,
+    notional_usd: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # One forward sweep over rates: returns, PnL and a sliding-window Welford
+    # mean/M2 update per lag (add the entering return, drop the leaving one).
+    size = rates.shape[0]
+    n_lags = lags.shape[0]
+    return_simple = np.full(size, np.nan)
+    return_log = np.full(size, np.nan)
+    pnl = np.full(size, np.nan)
+    roll_mean = np.full((n_lags, size), np.nan)
+    roll_std = np.full((n_lags, size), np.nan)
+    means = np.zeros(n_lags)
+    m2s = np.zeros(n_lags)
+
+    for i in range(1, size):
+        value = rates[i] / rates[i - 1] - 1.0
+        return_simple[i] = value
+        return_log[i] = np.log1p(value)
+        pnl[i] = notional_usd * value
+        for k in range(n_lags):
+            window = lags[k]
+            if i <= window:
+                delta = value - means[k]
+                means[k] += delta / i
+                m2s[k] += delta * (value - means[k])
+            else:
+                leaving = return_simple[i - window]
+                previous_mean = means[k]
+                means[k] += (value - leaving) / window
+                m2s[k] += (value - leaving) * (
+                    value - means[k] + leaving - previous_mean
+                )
+            if i >= window:
+                roll_mean[k, i] = means[k]
+                roll_std[k, i] = np.sqrt(max(m2s[k], 0.0) / window)
+
+    return return_simple, return_log, pnl, roll_mean, roll_std
+
+
+_compiled_feature_kernel = (
+    njit(cache=True)(_fused_feature_kernel) if njit is not None else None
+)
+
+
+def _return_and_rolling_arrays(
+    rates: np.ndarray,
+    lags: tuple[int, ...],
+    notional_usd: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    if _compiled_feature_kernel is not None:
+        return _compiled_feature_kernel(
+            rates, np.asarray(lags, dtype=np.int64), float(notional_usd)
+        )
+
+    return_simple = np.empty_like(rates)
+    return_simple[0] = np.nan
+    return_simple[1:] = rates[1:] / rates[:-1] - 1.0
+    return_log = np.log1p(return_simple)
+    pnl = notional_usd * return_simple
+    roll_mean = np.vstack([_rolling_mean(return_simple, lag) for lag in lags])
+    roll_std = np.vstack([_rolling_std(return_simple, lag) for lag in lags])
+    return return_simple, return_log, pnl, roll_mean, roll_std
+
+
 def clean(df: pd.DataFrame) -> pd.DataFrame:
     """Clean raw FX data by parsing types, sorting, and enforcing positive rates."""
     missing = [col for col in REQUIRED_INPUT_COLUMNS if col not in df.columns]
@@ -49,11 +163,11 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
 
     if cleaned.empty:
         raise ValueError("No rows remain after cleaning.")
-    if (cleaned["rate"] <= 0).any():
+    if cleaned["rate"].to_numpy().min() <= 0:
         raise ValueError("All rates must be strictly positive for return calculations.")
     if not cleaned["date"].is_monotonic_increasing:
         raise ValueError("Dates must be sorted ascending after cleaning.")
-    if cleaned["date"].duplicated().any():
+    if not cleaned["date"].is_unique:
         raise ValueError("Dates must be unique after cleaning.")
 
     return cleaned
@@ -70,24 +184,41 @@ def build_features(
         raise ValueError("notional_usd must be strictly positive.")
     normalized_lags = _validate_lags(lags)
 
-    features = clean(df)
-    features["return_simple"] = features["rate"] / features["rate"].shift(1) - 1.0
-    features["return_log"] = np.log(features["rate"] / features["rate"].shift(1))
-    features["pnl"] = notional_usd * features["return_simple"]
-    features["pnl_next_day"] = features["pnl"].shift(-1)
-    features["is_weekend"] = (features["date"].dt.dayofweek >= 5).astype(int)
-
-    for lag in normalized_lags:
-        features[f"return_simple_lag_{lag}"] = features["return_simple"].shift(lag)
-        features[f"return_log_lag_{lag}"] = features["return_log"].shift(lag)
-        features[f"pnl_lag_{lag}"] = features["pnl"].shift(lag)
-        features[f"roll_mean_return_simple_{lag}"] = (
-            features["return_simple"].rolling(window=lag, min_periods=lag).mean()
-        )
-        features[f"roll_vol_return_simple_{lag}"] = (
-            features["return_simple"].rolling(window=lag, min_periods=lag).std(ddof=0)
-        )
+    cleaned = clean(df)
+    rates = cleaned["rate"].to_numpy(dtype=np.float64)
+    return_simple, return_log, pnl, roll_mean, roll_std = _return_and_rolling_arrays(
+        rates, normalized_lags, notional_usd
+    )
+    pnl_next_day = np.append(pnl[1:], np.nan)
+    # Days since 1970-01-01 (a Thursday); (days + 3) % 7 maps Monday to 0.
+    days = cleaned["date"].to_numpy(dtype="datetime64[D]").view(np.int64)
+    is_weekend = ((days + 3) % 7 >= 5).astype(np.int8)
+
+    return_simple_compact = return_simple.astype(RETURN_FEATURE_DTYPE)
+    return_log_compact = return_log.astype(RETURN_FEATURE_DTYPE)
+
+    columns: dict[str, np.ndarray] = {
+        "date": cleaned["date"].to_numpy(),
+        "rate": rates,
+        "return_simple": return_simple_compact,
+        "return_log": return_log_compact,
+        "pnl": pnl,
+        "pnl_next_day": pnl_next_day,
+        "is_weekend": is_weekend,
+    }
+    return_simple_lags = _lagged_views(return_simple_compact, normalized_lags)
+    return_log_lags = _lagged_views(return_log_compact, normalized_lags)
+    pnl_lags = _lagged_views(pnl, normalized_lags)
+    roll_mean = roll_mean.astype(RETURN_FEATURE_DTYPE)
+    roll_std = roll_std.astype(RETURN_FEATURE_DTYPE)
+    for position, lag in enumerate(normalized_lags):
+        columns[f"return_simple_lag_{lag}"] = return_simple_lags[lag]
+        columns[f"return_log_lag_{lag}"] = return_log_lags[lag]
+        columns[f"pnl_lag_{lag}"] = pnl_lags[lag]
+        columns[f"roll_mean_return_simple_{lag}"] = roll_mean[position]
+        columns[f"roll_vol_return_simple_{lag}"] = roll_std[position]
 
+    features = pd.DataFrame(columns)
     features = features.dropna().reset_index(drop=True)
 
     if features.empty:
@@ -95,11 +226,11 @@ def build_features(
             "Insufficient rows after lag/rolling/target construction. "
             "Provide a longer history or smaller lag windows."
         )
-    if features.isna().any().any():
+    if np.isnan(features.select_dtypes(include=[np.number]).to_numpy()).any():
         raise ValueError("Feature frame contains NaNs after cleanup.")
     if not features["date"].is_monotonic_increasing:
         raise ValueError("Feature dates must remain sorted ascending.")
-    if features["date"].duplicated().any():
+    if not features["date"].is_unique:
         raise ValueError("Feature dates must remain unique.")
 
     return features
@@ -119,7 +250,7 @@ def train_test_split_time(
         raise ValueError("Feature frame must contain a 'date' column for time split.")
     if not df["date"].is_monotonic_increasing:
         raise ValueError("Feature frame must be sorted by date before time split.")
-    if df["date"].duplicated().any():
+    if not df["date"].is_unique:
         raise ValueError("Feature frame contains duplicate dates.")
     if len(df) <= test_days:
         raise ValueError(
@@ -128,10 +259,13 @@ def train_test_split_time(
         )
 
     split_idx = len(df) - test_days
-    feature_cols = [col for col in df.columns if col != target_col]
+    # Slice one column-subset frame so each split is a block view; a single
+    # to_numpy() would upcast the datetime column to object.
+    feature_frame = df.drop(columns=[target_col])
+    target = df[target_col].to_numpy()
 
-    x_train = df.iloc[:split_idx][feature_cols].reset_index(drop=True)
-    x_test = df.iloc[split_idx:][feature_cols].reset_index(drop=True)
-    y_train = df.iloc[:split_idx][target_col].reset_index(drop=True)
-    y_test = df.iloc[split_idx:][target_col].reset_index(drop=True)
+    x_train = feature_frame.iloc[:split_idx].reset_index(drop=True)
+    x_test = feature_frame.iloc[split_idx:].reset_index(drop=True)
+    y_train = pd.Series(target[:split_idx], name=target_col, copy=False)
+    y_test = pd.Series(target[split_idx:], name=target_col, copy=False)
     return x_train, x_test, y_train, y_test
@@ -8,10 +8,18 @@ import time
 import urllib.error
 import urllib.request
 import xml.etree.ElementTree as ET
-from datetime import date, datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from io import BytesIO
 from pathlib import Path
+from typing import Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 
 from src.config import (
     BANGUAT_WSDL_ENDPOINT,
@@ -23,15 +31,55 @@ from src.config import (
     RAW_METADATA_FILE,
     SOAP_BACKOFF_BASE_SECONDS,
     SOAP_BACKOFF_MAX_SECONDS,
+    SOAP_CACHE_DIR,
     SOAP_MAX_RETRIES,
+    SOAP_MAX_WORKERS,
     SOAP_TIMEOUT_SECONDS,
+    ensure_parent_dir,
 )
 
 REQUIRED_COLUMNS = ["date", "rate"]
+_REQUIRED_COLUMN_SET = frozenset(REQUIRED_COLUMNS)
 FEATURE_REQUIRED_COLUMNS = ["date", "pnl_next_day"]
 SOAP_ACTION = "http://www.banguat.gob.gt/variables/ws/TipoCambioRango"
 SOAP_NAMESPACE = "http://www.banguat.gob.gt/variables/ws/"
 SOAP_ENVELOPE_NAMESPACE = "http://schemas.xmlsoap.org/soap/envelope/"
+_SOAP_ENVELOPE_TEMPLATE = f"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+               xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+               xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <TipoCambioRango xmlns="{SOAP_NAMESPACE}">
+      <fechainit>__START__</fechainit>
+      <fechafin>__END__</fechafin>
+    </TipoCambioRango>
+  </soap:Body>
+</soap:Envelope>
+""".encode("utf-8")
+WRITE_CHUNK_BYTES = 1024 * 1024
+# SHA-256 digests keyed by (resolved path, mtime_ns, size).
+_HASH_CACHE: dict[tuple[str, int, int], str] = {}
+PARQUET_WRITE_OPTIONS = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "row_group_size": 50_000,
+    "use_dictionary": True,
+    "write_statistics": True,
+}
+# The strict (date, rate) schema is timestamp + float64, where dictionary pages
+# only add a hash-build pass; statistics stay on for date-range row-group pruning.
+PROCESSED_PARQUET_WRITE_OPTIONS = {
+    "row_group_size": PARQUET_WRITE_OPTIONS["row_group_size"],
+    "use_dictionary": False,
+    "write_statistics": True,
+}
+# LZ4 is near-free to encode and decode for this small fixed-width table.
+PROCESSED_PARQUET_COMPRESSION = "lz4"
+PROCESSED_SCHEMA = pa.schema([("date", pa.timestamp("us")), ("rate", pa.float64())])
+
+
+class SchemaMismatchError(ValueError):
+    """Raised when a frame's columns do not match the required schema."""
 
 
 def _parse_iso_date(value: str, field_name: str) -> date:
@@ -46,30 +94,16 @@ def _format_ddmmyyyy(value: date) -> str:
 
 
 def _iter_yearly_ranges(start: date, end: date) -> list[tuple[date, date]]:
-    ranges: list[tuple[date, date]] = []
-    cursor = start
-    while cursor <= end:
-        year_end = date(cursor.year, 12, 31)
-        chunk_end = min(year_end, end)
-        ranges.append((cursor, chunk_end))
-        cursor = chunk_end + timedelta(days=1)
-    return ranges
+    year_starts = pd.date_range(start, end, freq="YS", inclusive="right")
+    starts = [start, *(ts.date() for ts in year_starts if ts.date() > start)]
+    ends = [min(date(chunk_start.year, 12, 31), end) for chunk_start in starts]
+    return list(zip(starts, ends))
 
 
 def _build_soap_envelope(start: date, end: date) -> bytes:
-    envelope = f"""<?xml version="1.0" encoding="utf-8"?>
-<soap:Envelope xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-               xmlns:xsd="http://www.w3.org/2001/XMLSchema"
-               xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
-  <soap:Body>
-    <TipoCambioRango xmlns="{SOAP_NAMESPACE}">
-      <fechainit>{_format_ddmmyyyy(start)}</fechainit>
-      <fechafin>{_format_ddmmyyyy(end)}</fechafin>
-    </TipoCambioRango>
-  </soap:Body>
-</soap:Envelope>
-"""
-    return envelope.encode("utf-8")
+    return _SOAP_ENVELOPE_TEMPLATE.replace(
+        b"__START__", _format_ddmmyyyy(start).encode("ascii")
+    ).replace(b"__END__", _format_ddmmyyyy(end).encode("ascii"))
 
 
 def _post_soap_request(start: date, end: date) -> bytes:
@@ -115,63 +149,132 @@ def _extract_rows_from_payload(
     payload: bytes,
     start: date,
     end: date,
-) -> list[dict[str, str | float]]:
+) -> tuple[pa.Array, pa.Array]:
+    var_tag = f"{{{SOAP_NAMESPACE}}}Var"
+    fecha_tag = f"{{{SOAP_NAMESPACE}}}fecha"
+    venta_tag = f"{{{SOAP_NAMESPACE}}}venta"
+    fault_tag = f"{{{SOAP_ENVELOPE_NAMESPACE}}}Fault"
+
+    raw_dates: list[str] = []
+    raw_rates: list[str] = []
     try:
-        root = ET.fromstring(payload)
+        for _, node in ET.iterparse(BytesIO(payload), events=("end",)):
+            if node.tag == fault_tag:
+                fault_message = node.findtext("faultstring") or "Unknown SOAP fault."
+                raise RuntimeError(
+                    "Banguat SOAP fault from endpoint "
+                    f"{BANGUAT_WSDL_ENDPOINT} for range {start} to {end}: "
+                    f"{fault_message}"
+                )
+            if node.tag != var_tag:
+                continue
+
+            raw_date = node.findtext(fecha_tag)
+            raw_rate = node.findtext(venta_tag)
+            if raw_date is None or raw_rate is None:
+                raise RuntimeError(
+                    "Banguat response row missing required fields 'fecha'/'venta' "
+                    f"for range {start} to {end}."
+                )
+            raw_dates.append(raw_date)
+            raw_rates.append(raw_rate)
+            node.clear()
     except ET.ParseError as exc:
         raise RuntimeError(
             "Invalid XML returned by Banguat SOAP endpoint "
             f"{BANGUAT_WSDL_ENDPOINT} for range {start} to {end}."
         ) from exc
 
-    fault = root.find(f".//{{{SOAP_ENVELOPE_NAMESPACE}}}Fault")
-    if fault is not None:
-        fault_message = fault.findtext("faultstring") or "Unknown SOAP fault."
+    return _parse_soap_columns(raw_dates, raw_rates, start, end)
+
+
+def _parse_soap_columns(
+    raw_dates: list[str],
+    raw_rates: list[str],
+    start: date,
+    end: date,
+) -> tuple[pa.Array, pa.Array]:
+    date_text = pc.utf8_trim_whitespace(pa.array(raw_dates, type=pa.string()))
+    rate_text = pc.utf8_trim_whitespace(pa.array(raw_rates, type=pa.string()))
+    dates = pc.strptime(date_text, format="%d/%m/%Y", unit="ns", error_is_null=True)
+    # Arrow's strptime rolls invalid days over (31/02 -> 03/03); reject them by
+    # comparing against the zero-padded input, since 1/2/2020 is valid input.
+    padded_text = pc.replace_substring_regex(
+        date_text, pattern=r"^(\d)/", replacement=r"0\1/"
+    )
+    padded_text = pc.replace_substring_regex(
+        padded_text, pattern=r"^(\d{2})/(\d)/", replacement=r"\1/0\2/"
+    )
+    roundtrip = pc.equal(pc.strftime(dates, format="%d/%m/%Y"), padded_text)
+    invalid = pc.invert(pc.fill_null(roundtrip, False))
+    first_invalid = pc.index(invalid, True).as_py()
+    if first_invalid >= 0:
         raise RuntimeError(
-            "Banguat SOAP fault from endpoint "
-            f"{BANGUAT_WSDL_ENDPOINT} for range {start} to {end}: {fault_message}"
+            "Banguat returned non-parseable fecha "
+            f"'{raw_dates[first_invalid]}' for range {start} to {end}."
         )
+    try:
+        rates = pc.cast(rate_text, pa.float64())
+    except pa.ArrowInvalid as exc:
+        raise RuntimeError(
+            f"Banguat returned non-numeric venta for range {start} to {end}: {exc}"
+        ) from exc
+    return dates, rates
 
-    rows: list[dict[str, str | float]] = []
-    for node in root.findall(f".//{{{SOAP_NAMESPACE}}}Var"):
-        raw_date = node.findtext(f"{{{SOAP_NAMESPACE}}}fecha")
-        raw_rate = node.findtext(f"{{{SOAP_NAMESPACE}}}venta")
-        if raw_date is None or raw_rate is None:
-            raise RuntimeError(
-                "Banguat response row missing required fields 'fecha'/'venta' "
-                f"for range {start} to {end}."
-            )
-        try:
-            parsed_date = datetime.strptime(raw_date.strip(), "%d/%m/%Y").date()
-        except ValueError as exc:
-            raise RuntimeError(
-                "Banguat returned non-parseable fecha "
-                f"'{raw_date}' for range {start} to {end}."
-            ) from exc
-        try:
-            parsed_rate = float(raw_rate.strip())
-        except ValueError as exc:
-            raise RuntimeError(
-                "Banguat returned non-numeric venta "
-                f"'{raw_rate}' for range {start} to {end}."
-            ) from exc
-        rows.append({"date": parsed_date.isoformat(), "rate": parsed_rate})
 
+def _soap_cache_path(start: date, end: date) -> Path:
+    key = hashlib.sha256(f"{start.isoformat()}:{end.isoformat()}".encode()).hexdigest()
+    return SOAP_CACHE_DIR / f"{key}.xml"
+
+
+def _is_historical_range(end: date) -> bool:
+    return end < date.today().replace(month=1, day=1)
+
+
+def _fetch_chunk_rows(start: date, end: date) -> tuple[pa.Array, pa.Array]:
+    cache_path = _soap_cache_path(start, end)
+    cacheable = _is_historical_range(end)
+    if cacheable:
+        try:
+            return _extract_rows_from_payload(cache_path.read_bytes(), start, end)
+        except FileNotFoundError:
+            pass
+
+    payload = _post_soap_request(start, end)
+    rows = _extract_rows_from_payload(payload, start, end)
+    if cacheable:
+        ensure_parent_dir(cache_path)
+        tmp_path = cache_path.with_suffix(".xml.tmp")
+        tmp_path.write_bytes(payload)
+        tmp_path.replace(cache_path)
     return rows
 
 
 def _validate_strict_schema(df: pd.DataFrame) -> None:
-    if list(df.columns) != REQUIRED_COLUMNS:
-        raise ValueError(
-            "Strict schema required. Columns must be exactly in this order: date, rate."
-        )
+    if list(df.columns) == REQUIRED_COLUMNS:
+        return
+    extra = [col for col in df.columns if col not in _REQUIRED_COLUMN_SET]
+    missing = sorted(_REQUIRED_COLUMN_SET.difference(df.columns))
+    details = "".join(
+        f" {label}: {', '.join(map(str, cols))}."
+        for label, cols in (("Missing", missing), ("Unexpected", extra))
+        if cols
+    )
+    raise SchemaMismatchError(
+        "Strict schema required. Columns must be exactly in this order: date, rate."
+        + details
+    )
 
 
 def _coerce_strict_types(df: pd.DataFrame) -> pd.DataFrame:
     try:
-        converted = df.copy()
-        converted["date"] = pd.to_datetime(converted["date"], errors="raise")
-        converted["rate"] = pd.to_numeric(converted["rate"], errors="raise")
+        # ISO8601 skips per-call format inference; cache reuses repeated dates.
+        converted = df.assign(
+            date=pd.to_datetime(
+                df["date"], format="ISO8601", cache=True, errors="raise"
+            ),
+            rate=pd.to_numeric(df["rate"], errors="raise"),
+        )
     except Exception as exc:
         raise ValueError(
             "Raw/processed data types are invalid. 'date' must be datetime-like and "
@@ -180,15 +283,60 @@ def _coerce_strict_types(df: pd.DataFrame) -> pd.DataFrame:
     return converted.sort_values("date").reset_index(drop=True)
 
 
+def _has_strict_types(df: pd.DataFrame) -> bool:
+    has_datetime = pd.api.types.is_datetime64_dtype(df["date"])
+    return has_datetime and pd.api.types.is_numeric_dtype(df["rate"])
+
+
+def _ensure_strict_types(df: pd.DataFrame) -> pd.DataFrame:
+    if not _has_strict_types(df):
+        return _coerce_strict_types(df)
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date")
+    return df.reset_index(drop=True)
+
+
+def _sha256_cache_key(file_path: Path) -> tuple[str, int, int]:
+    stat = file_path.stat()
+    return (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
 def _compute_sha256(file_path: Path) -> str:
+    key = _sha256_cache_key(file_path)
+    cached = _HASH_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     hasher = hashlib.sha256()
     with file_path.open("rb") as handle:
         for chunk in iter(lambda: handle.read(8192), b""):
             hasher.update(chunk)
-    return hasher.hexdigest()
+    digest = hasher.hexdigest()
+    _HASH_CACHE[key] = digest
+    return digest
+
+
+def _write_bytes_with_sha256(out_path: Path, payload: bytes | pa.Buffer) -> str:
+    hasher = hashlib.sha256()
+    view = memoryview(payload)
+    with out_path.open("wb") as handle:
+        for offset in range(0, len(view), WRITE_CHUNK_BYTES):
+            chunk = view[offset : offset + WRITE_CHUNK_BYTES]
+            handle.write(chunk)
+            hasher.update(chunk)
+    digest = hasher.hexdigest()
+    _HASH_CACHE[_sha256_cache_key(out_path)] = digest
+    return digest
+
+
+def _write_bytes_atomic(out_path: Path, payload: bytes | pa.Buffer) -> None:
+    tmp_path = out_path.with_name(f"{out_path.name}.tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(memoryview(payload))
+    tmp_path.replace(out_path)
 
 
-def _write_raw_metadata(csv_path: Path, df: pd.DataFrame) -> None:
+def _write_raw_metadata(df: pd.DataFrame, sha256: str) -> None:
     requested_start = str(
         df.attrs.get("requested_start_date", DEFAULT_DOWNLOAD_START_DATE)
     )
@@ -208,10 +356,10 @@ def _write_raw_metadata(csv_path: Path, df: pd.DataFrame) -> None:
         "min_date": min_date,
         "max_date": max_date,
         "schema": REQUIRED_COLUMNS,
-        "sha256": _compute_sha256(csv_path),
+        "sha256": sha256,
     }
 
-    RAW_METADATA_FILE.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(RAW_METADATA_FILE)
     RAW_METADATA_FILE.write_text(
         f"{json.dumps(metadata, indent=2, sort_keys=True)}\n", encoding="utf-8"
     )
@@ -220,6 +368,7 @@ def _write_raw_metadata(csv_path: Path, df: pd.DataFrame) -> None:
 def download_data(
     start_date: str | None = None,
     end_date: str | None = None,
+    allow_empty: bool = False,
 ) -> pd.DataFrame:
     """Download USD/GTQ data from Banguat SOAP and return a strict DataFrame."""
     start = _parse_iso_date(start_date or DEFAULT_DOWNLOAD_START_DATE, "start_date")
@@ -228,54 +377,126 @@ def download_data(
     if start > end:
         raise ValueError("start_date must be earlier than or equal to end_date.")
 
-    all_rows: list[dict[str, str | float]] = []
-    for chunk_start, chunk_end in _iter_yearly_ranges(start, end):
-        payload = _post_soap_request(chunk_start, chunk_end)
-        all_rows.extend(_extract_rows_from_payload(payload, chunk_start, chunk_end))
+    ranges = _iter_yearly_ranges(start, end)
+    chunk_starts = [chunk_start for chunk_start, _ in ranges]
+    chunk_ends = [chunk_end for _, chunk_end in ranges]
+    executor = ThreadPoolExecutor(max_workers=min(SOAP_MAX_WORKERS, len(ranges)))
+    try:
+        # map() yields results in range order, keeping the frame deterministic.
+        chunk_rows = list(executor.map(_fetch_chunk_rows, chunk_starts, chunk_ends))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    table = pa.Table.from_arrays(
+        [
+            pa.chunked_array(
+                [dates for dates, _ in chunk_rows], type=pa.timestamp("ns")
+            ),
+            pa.chunked_array([rates for _, rates in chunk_rows], type=pa.float64()),
+        ],
+        names=REQUIRED_COLUMNS,
+    )
 
-    if not all_rows:
+    if table.num_rows == 0 and not allow_empty:
         raise RuntimeError(
             "No FX rows were returned from Banguat for the requested range "
             f"{start.isoformat()} to {end.isoformat()}."
         )
 
-    df = pd.DataFrame(all_rows, columns=REQUIRED_COLUMNS)
-    df = _coerce_strict_types(df)
+    df = _ensure_strict_types(table.to_pandas())
     df = df.drop_duplicates(subset=["date"], keep="last").reset_index(drop=True)
     df.attrs["requested_start_date"] = start.isoformat()
     df.attrs["requested_end_date"] = end.isoformat()
     return df
 
 
+def _serialize_raw_snapshot(df: pd.DataFrame, suffix: str) -> bytes | pa.Buffer:
+    if suffix == ".csv":
+        return df.to_csv(index=False, date_format="%Y-%m-%d").encode("utf-8")
+    sink = pa.BufferOutputStream()
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        sink,
+        compression="snappy",
+        use_dictionary=False,
+    )
+    return sink.getvalue()
+
+
 def save_raw_snapshot(df: pd.DataFrame, path: Path | None = None) -> Path:
-    """Save strict raw snapshot CSV and write metadata sidecar JSON."""
+    """Save strict raw snapshot and write metadata sidecar JSON.
+
+    Snapshots are Parquet (Snappy) by default; a ``.csv`` path writes the legacy
+    CSV layout.
+    """
     _validate_strict_schema(df)
     out_path = path if path is not None else DEFAULT_RAW_FILE
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(out_path)
 
-    normalized = _coerce_strict_types(df)
+    normalized = _ensure_strict_types(df)
     normalized.attrs.update(df.attrs)
 
-    csv_ready = normalized.copy()
-    csv_ready["date"] = csv_ready["date"].dt.strftime("%Y-%m-%d")
-
-    csv_ready.to_csv(out_path, index=False)
-    _write_raw_metadata(out_path, normalized)
+    payload = _serialize_raw_snapshot(normalized, out_path.suffix)
+    sha256 = _write_bytes_with_sha256(out_path, payload)
+    _write_raw_metadata(normalized, sha256)
     return out_path
 
 
+def _read_raw_csv(raw_path: Path) -> pd.DataFrame:
+    table = pa_csv.read_csv(
+        raw_path,
+        convert_options=pa_csv.ConvertOptions(
+            column_types={"date": pa.date32(), "rate": pa.float64()}
+        ),
+    )
+    date_index = table.schema.get_field_index("date")
+    if date_index >= 0:
+        table = table.set_column(
+            date_index, "date", table.column(date_index).cast(pa.timestamp("us"))
+        )
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
 def load_raw(path: Path | None = None) -> pd.DataFrame:
-    """Load raw snapshot CSV with strict schema and dtype validation."""
+    """Load raw snapshot (Parquet, or legacy CSV) with strict schema validation."""
     raw_path = path if path is not None else DEFAULT_RAW_FILE
-    if not raw_path.exists():
+    try:
+        if raw_path.suffix == ".csv":
+            df = _read_raw_csv(raw_path)
+        else:
+            df = pd.read_parquet(raw_path)
+    except FileNotFoundError as exc:
         raise FileNotFoundError(
             "Raw data file not found at "
             f"{raw_path}. Expected file with strict columns: date, rate."
-        )
-
-    df = pd.read_csv(raw_path)
+        ) from exc
+    except ValueError as exc:
+        raise ValueError(
+            f"Raw data at {raw_path} could not be parsed with strict columns "
+            "date (YYYY-MM-DD) and rate (numeric)."
+        ) from exc
     _validate_strict_schema(df)
-    return _coerce_strict_types(df)
+    return _ensure_strict_types(df)
+
+
+def load_raw_metadata() -> dict[str, Any] | None:
+    """Load the raw snapshot metadata sidecar, or None when it does not exist."""
+    try:
+        return json.loads(RAW_METADATA_FILE.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def raw_snapshot_matches_metadata(
+    metadata: dict[str, Any],
+    path: Path | None = None,
+) -> bool:
+    """Check that the raw snapshot exists and matches the sidecar SHA-256."""
+    raw_path = path if path is not None else DEFAULT_RAW_FILE
+    try:
+        return _compute_sha256(raw_path) == metadata.get("sha256")
+    except FileNotFoundError:
+        return False
 
 
 def load_raw_fx_rates(path: Path | None = None) -> pd.DataFrame:
@@ -283,79 +504,150 @@ def load_raw_fx_rates(path: Path | None = None) -> pd.DataFrame:
     return load_raw(path)
 
 
-def save_processed(df: pd.DataFrame, path: Path | None = None) -> Path:
-    """Persist strict processed dataset as Parquet."""
+def _save_processed_arrays(
+    dates: np.ndarray,
+    rates: np.ndarray,
+    out_path: Path,
+    compression: str = PROCESSED_PARQUET_COMPRESSION,
+) -> Path:
+    table = pa.Table.from_arrays(
+        [pa.array(dates, type=pa.timestamp("us")), pa.array(rates, type=pa.float64())],
+        schema=PROCESSED_SCHEMA,
+    )
+    sink = pa.BufferOutputStream()
+    pq.write_table(
+        table, sink, compression=compression, **PROCESSED_PARQUET_WRITE_OPTIONS
+    )
+    _write_bytes_atomic(out_path, sink.getvalue())
+    return out_path
+
+
+def save_processed(
+    df: pd.DataFrame,
+    path: Path | None = None,
+    compression: str = PROCESSED_PARQUET_COMPRESSION,
+) -> Path:
+    """Persist strict processed dataset as Parquet.
+
+    Uses LZ4 by default; pass ``compression="zstd"`` for smaller files or
+    ``"snappy"`` for readers without LZ4 support.
+    """
     _validate_strict_schema(df)
     out_path = path if path is not None else DEFAULT_PROCESSED_FILE
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    normalized = _coerce_strict_types(df)
-    normalized.to_parquet(out_path, index=False)
-    return out_path
+    ensure_parent_dir(out_path)
+
+    normalized = _ensure_strict_types(df)
+    return _save_processed_arrays(
+        normalized["date"].to_numpy(),
+        normalized["rate"].to_numpy(dtype=np.float64),
+        out_path,
+        compression,
+    )
 
 
 def load_processed(path: Path | None = None) -> pd.DataFrame:
     """Load strict processed Parquet dataset."""
     processed_path = path if path is not None else DEFAULT_PROCESSED_FILE
-    if not processed_path.exists():
+    try:
+        table = pq.read_table(processed_path, memory_map=True, pre_buffer=True)
+    except FileNotFoundError as exc:
         raise FileNotFoundError(
             "Processed data file not found at "
             f"{processed_path}. Expected Parquet file with columns: date, rate."
-        )
-
-    df = pd.read_parquet(processed_path)
+        ) from exc
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
     _validate_strict_schema(df)
-    return _coerce_strict_types(df)
+    return _ensure_strict_types(df)
 
 
 def _coerce_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
     missing = [col for col in FEATURE_REQUIRED_COLUMNS if col not in df.columns]
     if missing:
         missing_display = ", ".join(missing)
-        raise ValueError(
+        raise SchemaMismatchError(
             "Feature frame schema mismatch. Missing required columns: "
             f"{missing_display}."
         )
 
-    converted = df.copy()
-    try:
-        converted["date"] = pd.to_datetime(converted["date"], errors="raise")
-        converted["pnl_next_day"] = pd.to_numeric(
-            converted["pnl_next_day"],
-            errors="raise",
-        )
-    except Exception as exc:
-        raise ValueError(
-            "Feature frame has invalid dtypes. 'date' must be datetime-like and "
-            "'pnl_next_day' numeric."
-        ) from exc
+    converted = df
+    if not (
+        pd.api.types.is_datetime64_dtype(df["date"])
+        and pd.api.types.is_numeric_dtype(df["pnl_next_day"])
+    ):
+        converted = df.copy()
+        try:
+            converted["date"] = pd.to_datetime(converted["date"], errors="raise")
+            converted["pnl_next_day"] = pd.to_numeric(
+                converted["pnl_next_day"],
+                errors="raise",
+            )
+        except Exception as exc:
+            raise ValueError(
+                "Feature frame has invalid dtypes. 'date' must be datetime-like and "
+                "'pnl_next_day' numeric."
+            ) from exc
 
-    converted = converted.sort_values("date").reset_index(drop=True)
-    if converted.isna().any().any():
+    if not converted["date"].is_monotonic_increasing:
+        converted = converted.sort_values("date")
+    converted = converted.reset_index(drop=True)
+    numeric_values = converted.select_dtypes(include=[np.number]).to_numpy(
+        dtype=np.float64
+    )
+    if converted["date"].isna().any() or np.isnan(numeric_values).any():
         raise ValueError("Feature frame contains NaNs.")
-    if converted["date"].duplicated().any():
+    if not converted["date"].is_unique:
         raise ValueError("Feature frame must contain unique dates.")
     return converted
 
 
-def save_feature_frame(df: pd.DataFrame, path: Path | None = None) -> Path:
-    """Persist Stage-3 feature frame as Parquet."""
-    out_path = path if path is not None else DEFAULT_FEATURES_FILE
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+def validate_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` in the normalized form ``load_feature_frame`` would produce."""
+    return _coerce_feature_frame(df)
 
-    normalized = _coerce_feature_frame(df)
-    normalized.to_parquet(out_path, index=False)
+
+def write_feature_frame(normalized: pd.DataFrame, path: Path | None = None) -> Path:
+    """Write a frame already returned by ``validate_feature_frame`` as Parquet."""
+    out_path = path if path is not None else DEFAULT_FEATURES_FILE
+    ensure_parent_dir(out_path)
+    normalized.to_parquet(
+        out_path, index=False, engine="pyarrow", **PARQUET_WRITE_OPTIONS
+    )
     return out_path
 
 
+def save_feature_frame(df: pd.DataFrame, path: Path | None = None) -> Path:
+    """Persist Stage-3 feature frame as Parquet."""
+    return write_feature_frame(_coerce_feature_frame(df), path)
+
+
 def load_feature_frame(path: Path | None = None) -> pd.DataFrame:
     """Load Stage-3 feature frame from Parquet."""
     feature_path = path if path is not None else DEFAULT_FEATURES_FILE
-    if not feature_path.exists():
+    try:
+        df = pd.read_parquet(feature_path)
+    except FileNotFoundError as exc:
         raise FileNotFoundError(
             "Feature frame file not found at "
             f"{feature_path}. Expected a Stage-3 features parquet file."
-        )
-
-    df = pd.read_parquet(feature_path)
+        ) from exc
     return _coerce_feature_frame(df)
+
+
+def save_predictions_csv(columns: dict[str, np.ndarray], path: Path) -> Path:
+    """Write a prediction table to CSV with PyArrow's multithreaded writer.
+
+    A ``date`` column is written as ISO dates; all other columns as numbers.
+    """
+    ensure_parent_dir(path)
+    arrays = {
+        name: (
+            pa.array(values).cast(pa.date32()) if name == "date" else pa.array(values)
+        )
+        for name, values in columns.items()
+    }
+    pa_csv.write_csv(
+        pa.table(arrays),
+        path,
+        write_options=pa_csv.WriteOptions(quoting_header="none"),
+    )
+    return path
@@ -4,10 +4,12 @@ import json
 from pathlib import Path
 from typing import Any
 
+from src.config import ensure_parent_dir
+
 
 def save_metrics(metrics: dict[str, Any], out_path: Path) -> None:
     """Persist metrics as deterministic JSON."""
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(out_path)
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(metrics, f, indent=2, sort_keys=True)
         f.write("\n")
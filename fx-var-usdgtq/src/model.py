@@ -2,40 +2,64 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from typing import Any
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.linear_model import LinearRegression, QuantileRegressor
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
-from src.config import MODEL_RANDOM_STATE, VAR_QUANTILE
+try:
+    import lz4  # noqa: F401 - enables joblib's lz4 compressor
+except ImportError:  # pragma: no cover - optional compressor
+    MODEL_BUNDLE_COMPRESSION: tuple[str, int] = ("zlib", 3)
+else:
+    MODEL_BUNDLE_COMPRESSION = ("lz4", 3)
 
+from src.config import MODEL_RANDOM_STATE, VAR_QUANTILE, ensure_parent_dir
 
-def _validate_training_inputs(X_train: pd.DataFrame, y_train: pd.Series) -> None:
-    if X_train.empty:
+# Models accept labelled frames or the contiguous float64 matrices built by the
+# pipeline.
+FeatureMatrix = pd.DataFrame | np.ndarray
+LINEAR_MODEL_TYPES = (LinearRegression, QuantileRegressor)
+ONNX_EXPORTABLE_MODELS = LINEAR_MODEL_TYPES
+ONNX_INPUT_NAME = "X"
+
+
+def _contains_nan(X: FeatureMatrix) -> bool:
+    return bool(np.isnan(np.asarray(X, dtype=np.float64)).any())
+
+
+def _prediction_index(X: FeatureMatrix) -> pd.Index | None:
+    return X.index if isinstance(X, pd.DataFrame) else None
+
+
+def _validate_training_inputs(X_train: FeatureMatrix, y_train: pd.Series) -> None:
+    if X_train.size == 0:
         raise ValueError("X_train is empty.")
     if y_train.empty:
         raise ValueError("y_train is empty.")
     if len(X_train) != len(y_train):
         raise ValueError("X_train and y_train lengths must match.")
-    if X_train.isna().any().any():
+    if _contains_nan(X_train):
         raise ValueError("X_train contains NaN values.")
     if y_train.isna().any():
         raise ValueError("y_train contains NaN values.")
 
 
-def _validate_prediction_input(X: pd.DataFrame) -> None:
-    if X.empty:
+def _validate_prediction_input(X: FeatureMatrix) -> None:
+    if X.size == 0:
         raise ValueError("Prediction matrix is empty.")
-    if X.isna().any().any():
+    if _contains_nan(X):
         raise ValueError("Prediction matrix contains NaN values.")
 
 
-def train_quantile_linear(X_train: pd.DataFrame, y_train: pd.Series) -> Any:
+def train_quantile_linear(X_train: FeatureMatrix, y_train: pd.Series) -> Any:
     """Train linear quantile baseline at q=1%."""
     _validate_training_inputs(X_train, y_train)
     model = Pipeline(
@@ -55,14 +79,16 @@ def train_quantile_linear(X_train: pd.DataFrame, y_train: pd.Series) -> Any:
     return model
 
 
-def predict_quantile_linear(model: Any, X: pd.DataFrame) -> pd.Series:
+def predict_quantile_linear(model: Any, X: FeatureMatrix) -> pd.Series:
     """Predict next-day 1% quantile PnL using linear quantile baseline."""
     _validate_prediction_input(X)
-    predictions = pd.Series(model.predict(X), index=X.index, name="pred_qr_linear")
+    predictions = pd.Series(
+        model.predict(X), index=_prediction_index(X), name="pred_qr_linear"
+    )
     return predictions
 
 
-def train_quantile_tree(X_train: pd.DataFrame, y_train: pd.Series) -> Any:
+def train_quantile_tree(X_train: FeatureMatrix, y_train: pd.Series) -> Any:
     """Train tree-based quantile baseline at q=1%."""
     _validate_training_inputs(X_train, y_train)
     model = Pipeline(
@@ -86,14 +112,26 @@ def train_quantile_tree(X_train: pd.DataFrame, y_train: pd.Series) -> Any:
     return model
 
 
-def predict_quantile_tree(model: Any, X: pd.DataFrame) -> pd.Series:
-    """Predict next-day 1% quantile PnL using tree quantile baseline."""
+def predict_quantile_tree_values(model: Any, X: FeatureMatrix) -> np.ndarray:
+    """Predict next-day 1% quantile PnL as a float64 array.
+
+    Boosting stages are accumulated by scikit-learn into a single output buffer,
+    so this returns that buffer directly without building a ``pd.Series``.
+    """
     _validate_prediction_input(X)
-    predictions = pd.Series(model.predict(X), index=X.index, name="pred_qr_tree")
-    return predictions
+    return np.asarray(model.predict(X), dtype=np.float64)
 
 
-def train_linear_mean(X_train: pd.DataFrame, y_train: pd.Series) -> Any:
+def predict_quantile_tree(model: Any, X: FeatureMatrix) -> pd.Series:
+    """Predict next-day 1% quantile PnL using tree quantile baseline."""
+    return pd.Series(
+        predict_quantile_tree_values(model, X),
+        index=_prediction_index(X),
+        name="pred_qr_tree",
+    )
+
+
+def train_linear_mean(X_train: FeatureMatrix, y_train: pd.Series) -> Any:
     """Train linear mean regression baseline."""
     _validate_training_inputs(X_train, y_train)
     model = Pipeline(
@@ -106,22 +144,142 @@ def train_linear_mean(X_train: pd.DataFrame, y_train: pd.Series) -> Any:
     return model
 
 
-def predict_linear_mean(model: Any, X: pd.DataFrame) -> pd.Series:
+def predict_linear_mean(model: Any, X: FeatureMatrix) -> pd.Series:
     """Predict expected next-day PnL using linear mean baseline."""
     _validate_prediction_input(X)
-    predictions = pd.Series(model.predict(X), index=X.index, name="pred_linear_mean")
+    predictions = pd.Series(
+        model.predict(X), index=_prediction_index(X), name="pred_linear_mean"
+    )
     return predictions
 
 
+def _folded_linear_coefficients(model: Any) -> tuple[np.ndarray, float]:
+    if not isinstance(model, Pipeline) or not isinstance(
+        model.steps[-1][1], LINEAR_MODEL_TYPES
+    ):
+        raise ValueError("Batched linear prediction requires fitted linear pipelines.")
+    estimator = model.steps[-1][1]
+    coef = np.asarray(estimator.coef_, dtype=np.float64).ravel()
+    intercept = float(estimator.intercept_)
+    for _, step in reversed(model.steps[:-1]):
+        if not isinstance(step, StandardScaler):
+            raise ValueError("Batched linear prediction supports StandardScaler only.")
+        # (x - mean) / scale @ coef + b == x @ (coef / scale) + (b - mean/scale @ coef)
+        if step.with_std:
+            coef = coef / step.scale_
+        if step.with_mean:
+            intercept -= float(step.mean_ @ coef)
+    return coef, intercept
+
+
+def predict_linear_batch(models: list[Any], X: FeatureMatrix) -> np.ndarray:
+    """Predict several fitted linear pipelines with one matrix product.
+
+    Each pipeline's scaler is folded into its coefficients, so the result column
+    ``j`` equals ``models[j].predict(X)``.
+    """
+    _validate_prediction_input(X)
+    folded = [_folded_linear_coefficients(model) for model in models]
+    weights = np.column_stack([coef for coef, _ in folded])
+    intercepts = np.array([intercept for _, intercept in folded])
+    return np.asarray(X, dtype=np.float64) @ weights + intercepts
+
+
+class OnnxModel:
+    """Thin ``predict`` wrapper around an ONNX Runtime inference session."""
+
+    def __init__(self, path: Path) -> None:
+        import onnxruntime as ort
+
+        self.session = ort.InferenceSession(
+            str(path), providers=["CPUExecutionProvider"]
+        )
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.feature_names = json.loads(metadata.get("feature_names", "null"))
+
+    def predict(self, X: FeatureMatrix) -> np.ndarray:
+        if isinstance(X, pd.DataFrame) and self.feature_names is not None:
+            X = X[self.feature_names]
+        values = np.asarray(X, dtype=np.float64)
+        return self.session.run(None, {ONNX_INPUT_NAME: values})[0].ravel()
+
+
+def _is_onnx_exportable(model: Any) -> bool:
+    return (
+        isinstance(model, Pipeline)
+        and isinstance(model.steps[-1][1], ONNX_EXPORTABLE_MODELS)
+        and hasattr(model, "n_features_in_")
+    )
+
+
+def _export_onnx(model: Any, path: Path) -> bool:
+    # skl2onnx is imported lazily: it is optional and slow to import, and the
+    # Stage-4 pipeline persists models through the joblib bundle instead.
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import DoubleTensorType
+    except ImportError:  # pragma: no cover - optional ONNX export
+        return False
+    try:
+        onnx_model = convert_sklearn(
+            model,
+            initial_types=[
+                (ONNX_INPUT_NAME, DoubleTensorType([None, model.n_features_in_]))
+            ],
+        )
+    except Exception:
+        return False
+    feature_names = getattr(model, "feature_names_in_", None)
+    entry = onnx_model.metadata_props.add()
+    entry.key = "feature_names"
+    entry.value = json.dumps(
+        None if feature_names is None else [str(name) for name in feature_names]
+    )
+    path.write_bytes(onnx_model.SerializeToString())
+    return True
+
+
 def save_model(model: Any, path: Path) -> Path:
-    """Save model artifact with joblib."""
-    path.parent.mkdir(parents=True, exist_ok=True)
+    """Save model artifact with joblib, plus an ONNX export for linear models.
+
+    The ONNX file is written next to ``path`` with an ``.onnx`` suffix when
+    ``skl2onnx`` is installed and the final pipeline step is linear; a failed
+    export leaves only the joblib artifact.
+    """
+    ensure_parent_dir(path)
     joblib.dump(model, path)
+    onnx_path = path.with_suffix(".onnx")
+    if not (_is_onnx_exportable(model) and _export_onnx(model, onnx_path)):
+        onnx_path.unlink(missing_ok=True)
     return path
 
 
 def load_model(path: Path) -> Any:
-    """Load model artifact saved with joblib."""
+    """Load model artifact, preferring its ONNX export when ONNX Runtime exists."""
     if not path.exists():
         raise FileNotFoundError(f"Model file not found at {path}.")
+    onnx_path = path.with_suffix(".onnx")
+    if onnx_path.exists():
+        try:
+            return OnnxModel(onnx_path)
+        except ImportError:  # pragma: no cover - optional ONNX inference
+            pass
     return joblib.load(path)
+
+
+def save_model_bundle(models: dict[str, Any], path: Path) -> Path:
+    """Save several named models as one compressed joblib bundle.
+
+    Uses lz4 compression when the ``lz4`` package is installed, zlib otherwise.
+    """
+    ensure_parent_dir(path)
+    joblib.dump(models, path, compress=MODEL_BUNDLE_COMPRESSION)
+    return path
+
+
+def load_model_bundle(path: Path) -> dict[str, Any]:
+    """Load a named-model bundle saved with ``save_model_bundle``."""
+    try:
+        return joblib.load(path)
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"Model bundle not found at {path}.") from exc
@@ -1,127 +1,278 @@
 """Pipeline entrypoint for Stage 4 baseline modeling."""
 
+import hashlib
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
 import pandas as pd
 
 from src.config import (
+    DEFAULT_DOWNLOAD_END_DATE,
+    DEFAULT_DOWNLOAD_START_DATE,
+    DEFAULT_FEATURES_FILE,
+    DEFAULT_NOTIONAL_USD,
     DEFAULT_TEST_DAYS,
+    FEATURE_LAGS,
+    MODEL_BUNDLE_NAME,
     MODEL_DIR,
+    MODEL_RANDOM_STATE,
     PREDICTIONS_FILE,
+    VAR_QUANTILE,
     ensure_directories,
+    ensure_parent_dir,
 )
 from src.features import TARGET_COLUMN, build_features, clean, train_test_split_time
 from src.io import (
     download_data,
-    load_feature_frame,
     load_raw,
-    save_feature_frame,
+    load_raw_metadata,
+    raw_snapshot_matches_metadata,
+    save_predictions_csv,
     save_raw_snapshot,
+    validate_feature_frame,
+    write_feature_frame,
 )
 from src.model import (
-    predict_linear_mean,
-    predict_quantile_linear,
-    predict_quantile_tree,
-    save_model,
+    predict_linear_batch,
+    predict_quantile_tree_values,
+    save_model_bundle,
     train_linear_mean,
     train_quantile_linear,
     train_quantile_tree,
 )
 
 
-def _build_model_matrix(df: pd.DataFrame) -> pd.DataFrame:
-    matrix = df.select_dtypes(include=["number"]).copy()
-    if matrix.empty:
+def _model_feature_columns(df: pd.DataFrame) -> list[str]:
+    return df.select_dtypes(include="number").columns.tolist()
+
+
+def _build_model_matrix(
+    df: pd.DataFrame, columns: list[str] | None = None
+) -> np.ndarray:
+    if columns is None:
+        columns = _model_feature_columns(df)
+    # Fill one C-ordered buffer column by column: DataFrame.to_numpy() on mixed
+    # dtypes returns a Fortran-ordered block that would need a second copy.
+    matrix = np.empty((len(df), len(columns)), dtype=np.float64)
+    for position, column in enumerate(columns):
+        np.copyto(matrix[:, position], df[column].to_numpy())
+    if matrix.size == 0:
         raise ValueError("No numeric feature columns available for model training.")
-    if matrix.isna().any().any():
+    if np.isnan(matrix).any():
         raise ValueError("Model matrix contains NaN values.")
     return matrix
 
 
-def _validate_prediction_series(
-    name: str,
-    predictions: pd.Series,
+def _refresh_raw_data() -> pd.DataFrame:
+    metadata = load_raw_metadata()
+    if (
+        metadata is None
+        or metadata.get("requested_start_date") != DEFAULT_DOWNLOAD_START_DATE
+        or not raw_snapshot_matches_metadata(metadata)
+    ):
+        return load_raw(save_raw_snapshot(download_data()))
+
+    cached = load_raw()
+    if str(metadata.get("requested_end_date", "")) >= DEFAULT_DOWNLOAD_END_DATE:
+        return cached
+
+    delta_start = date.fromisoformat(metadata["max_date"]) + timedelta(days=1)
+    delta = download_data(start_date=delta_start.isoformat(), allow_empty=True)
+    merged = pd.concat([cached, delta], ignore_index=True)
+    merged = merged.drop_duplicates(subset=["date"], keep="last")
+    merged.attrs["requested_start_date"] = DEFAULT_DOWNLOAD_START_DATE
+    merged.attrs["requested_end_date"] = DEFAULT_DOWNLOAD_END_DATE
+    return load_raw(save_raw_snapshot(merged))
+
+
+# Bump when feature engineering or model training changes so stale caches miss.
+STAGE4_CACHE_VERSION = 2
+
+
+def _stage4_cache_path(raw_sha256: str) -> Path:
+    settings = {
+        "raw_sha256": raw_sha256,
+        "version": STAGE4_CACHE_VERSION,
+        "test_days": DEFAULT_TEST_DAYS,
+        "lags": list(FEATURE_LAGS),
+        "notional_usd": DEFAULT_NOTIONAL_USD,
+        "quantile": VAR_QUANTILE,
+        "random_state": MODEL_RANDOM_STATE,
+    }
+    key = hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+    return MODEL_DIR / "cache" / f"{key}.joblib"
+
+
+def _load_stage4_cache(cache_path: Path) -> dict[str, Any] | None:
+    try:
+        return joblib.load(cache_path)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or version-incompatible pickles are a miss; drop them so the
+        # rebuilt entry replaces them.
+        cache_path.unlink(missing_ok=True)
+        return None
+
+
+def _save_stage4_cache(
+    cache_path: Path,
+    features: pd.DataFrame,
+    models: dict[str, Any],
+) -> None:
+    ensure_parent_dir(cache_path)
+    for stale_path in cache_path.parent.glob("*.joblib*"):
+        if stale_path != cache_path:
+            stale_path.unlink()
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+    joblib.dump({"features": features, "models": models}, tmp_path)
+    tmp_path.replace(cache_path)
+
+
+def _validate_prediction_matrix(
+    predictions: dict[str, np.ndarray],
     expected_length: int,
 ) -> None:
-    if len(predictions) != expected_length:
-        raise ValueError(
-            f"{name} prediction length {len(predictions)} does not match "
-            f"expected test length {expected_length}."
+    for name, values in predictions.items():
+        if len(values) != expected_length:
+            raise ValueError(
+                f"{name} prediction length {len(values)} does not match "
+                f"expected test length {expected_length}."
+            )
+    stacked = np.stack(list(predictions.values()))
+    nan_rows = np.isnan(stacked).any(axis=1)
+    if nan_rows.any():
+        offenders = ", ".join(
+            name for name, has_nan in zip(predictions, nan_rows) if has_nan
         )
-    if predictions.isna().any():
-        raise ValueError(f"{name} predictions contain NaN values.")
+        raise ValueError(f"{offenders} predictions contain NaN values.")
 
 
-def run() -> None:
-    """Refresh data, build features, train Stage-4 models, and save predictions."""
+def run(force_refresh: bool = False) -> None:
+    """Refresh data, build features, train Stage-4 models, and save predictions.
+
+    Features and trained models are cached under ``MODEL_DIR / "cache"`` keyed by
+    the raw snapshot SHA-256; ``force_refresh=True`` rebuilds them regardless.
+    """
     ensure_directories()
+    # Writes the features Parquet in the background while models train.
+    feature_writer = ThreadPoolExecutor(max_workers=1)
+    pending_feature_write: Future[Path] | None = None
     try:
-        downloaded = download_data()
-        raw_path = save_raw_snapshot(downloaded)
-        raw_df = load_raw(raw_path)
-        cleaned_df = clean(raw_df)
-        features_df = build_features(cleaned_df)
-        feature_path = save_feature_frame(features_df)
-        loaded_features = load_feature_frame(feature_path)
+        raw_df = _refresh_raw_data()
+        raw_metadata = load_raw_metadata()
+        cache_path = (
+            _stage4_cache_path(raw_metadata["sha256"])
+            if raw_metadata is not None
+            else None
+        )
+        cached = (
+            _load_stage4_cache(cache_path)
+            if cache_path is not None and not force_refresh
+            else None
+        )
+
+        if cached is None:
+            cleaned_df = clean(raw_df)
+            loaded_features = validate_feature_frame(build_features(cleaned_df))
+        else:
+            loaded_features = cached["features"]
+        # Cached features were validated before caching; rewrite the Parquet only
+        # when it was rebuilt or has gone missing.
+        if cached is None or not DEFAULT_FEATURES_FILE.exists():
+            pending_feature_write = feature_writer.submit(
+                write_feature_frame, loaded_features, DEFAULT_FEATURES_FILE
+            )
+        if not pd.api.types.is_datetime64_any_dtype(loaded_features["date"]):
+            raise ValueError("Stage-4 feature frame 'date' must be datetime64.")
 
         x_train, x_test, y_train, y_test = train_test_split_time(
             loaded_features,
             test_days=DEFAULT_TEST_DAYS,
             target_col=TARGET_COLUMN,
         )
-        x_train_matrix = _build_model_matrix(
-            x_train.drop(columns=["date"], errors="ignore")
-        )
-        x_test_matrix = _build_model_matrix(
-            x_test.drop(columns=["date"], errors="ignore")
-        )
-
-        model_qr_linear = train_quantile_linear(x_train_matrix, y_train)
-        model_qr_tree = train_quantile_tree(x_train_matrix, y_train)
-        model_linear_mean = train_linear_mean(x_train_matrix, y_train)
-
-        MODEL_DIR.mkdir(parents=True, exist_ok=True)
-        save_model(model_qr_linear, MODEL_DIR / "qr_linear_q01.joblib")
-        save_model(model_qr_tree, MODEL_DIR / "qr_tree_q01.joblib")
-        save_model(model_linear_mean, MODEL_DIR / "linear_mean.joblib")
-
-        pred_qr_linear = predict_quantile_linear(model_qr_linear, x_test_matrix)
-        pred_qr_tree = predict_quantile_tree(model_qr_tree, x_test_matrix)
-        pred_linear_mean = predict_linear_mean(model_linear_mean, x_test_matrix)
+        feature_columns = _model_feature_columns(x_train)
+        x_train_matrix = _build_model_matrix(x_train, feature_columns)
+        x_test_matrix = _build_model_matrix(x_test, feature_columns)
 
-        expected_len = len(y_test)
-        _validate_prediction_series("pred_qr_linear", pred_qr_linear, expected_len)
-        _validate_prediction_series("pred_qr_tree", pred_qr_tree, expected_len)
-        _validate_prediction_series("pred_linear_mean", pred_linear_mean, expected_len)
+        if cached is not None:
+            model_qr_linear = cached["models"]["qr_linear"]
+            model_qr_tree = cached["models"]["qr_tree"]
+            model_linear_mean = cached["models"]["linear_mean"]
+        else:
+            model_qr_linear = train_quantile_linear(x_train_matrix, y_train)
+            model_qr_tree = train_quantile_tree(x_train_matrix, y_train)
+            model_linear_mean = train_linear_mean(x_train_matrix, y_train)
+            if cache_path is not None:
+                _save_stage4_cache(
+                    cache_path,
+                    loaded_features,
+                    {
+                        "qr_linear": model_qr_linear,
+                        "qr_tree": model_qr_tree,
+                        "linear_mean": model_linear_mean,
+                    },
+                )
 
-        predictions = pd.DataFrame(
+        save_model_bundle(
             {
-                "date": pd.to_datetime(x_test["date"]).reset_index(drop=True),
-                TARGET_COLUMN: y_test.reset_index(drop=True),
-                "pred_qr_linear": pred_qr_linear.reset_index(drop=True),
-                "pred_qr_tree": pred_qr_tree.reset_index(drop=True),
-                "pred_linear_mean": pred_linear_mean.reset_index(drop=True),
-            }
+                "qr_linear": model_qr_linear,
+                "qr_tree": model_qr_tree,
+                "linear_mean": model_linear_mean,
+            },
+            MODEL_DIR / MODEL_BUNDLE_NAME,
         )
-        if predictions.isna().any().any():
+
+        linear_predictions = predict_linear_batch(
+            [model_qr_linear, model_linear_mean], x_test_matrix
+        )
+        predictions = {
+            "pred_qr_linear": linear_predictions[:, 0],
+            "pred_qr_tree": predict_quantile_tree_values(model_qr_tree, x_test_matrix),
+            "pred_linear_mean": linear_predictions[:, 1],
+        }
+        _validate_prediction_matrix(predictions, len(y_test))
+
+        prediction_columns = {
+            "date": x_test["date"].to_numpy(),
+            TARGET_COLUMN: y_test.to_numpy(),
+            **predictions,
+        }
+        # Prediction columns were NaN-checked above; only date and target remain.
+        if (
+            np.isnat(prediction_columns["date"]).any()
+            or np.isnan(prediction_columns[TARGET_COLUMN]).any()
+        ):
             raise ValueError("Prediction table contains NaN values.")
 
-        PREDICTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        predictions.to_csv(PREDICTIONS_FILE, index=False)
+        save_predictions_csv(prediction_columns, PREDICTIONS_FILE)
+        if pending_feature_write is not None:
+            pending_feature_write.result()
     except Exception as exc:
         raise RuntimeError(
             "Stage 4 pipeline failed during data acquisition/modeling. "
             "Check network access to Banguat, strict raw schema (date, rate), "
             "Stage-4 feature matrix construction, and model training/prediction."
         ) from exc
+    finally:
+        feature_writer.shutdown()
 
-    test_min_date = predictions["date"].min().date().isoformat()
-    test_max_date = predictions["date"].max().date().isoformat()
+    # Feature dates are sorted by validation, so the endpoints are the extremes.
+    test_dates = prediction_columns["date"]
+    test_min_date = pd.Timestamp(test_dates[0]).date().isoformat()
+    test_max_date = pd.Timestamp(test_dates[-1]).date().isoformat()
 
     print(
         "STAGE4_MODELS "
-        f"feature_rows={len(loaded_features)} test_rows={len(predictions)} "
+        f"feature_rows={len(loaded_features)} test_rows={len(test_dates)} "
         f"test_min_date={test_min_date} test_max_date={test_max_date} "
         f"target={TARGET_COLUMN} predictions_file={PREDICTIONS_FILE.name} "
-        f"models=qr_linear_q01.joblib,qr_tree_q01.joblib,linear_mean.joblib"
+        f"models={MODEL_BUNDLE_NAME}[qr_linear,qr_tree,linear_mean]"
     )
     print(
         "FX VaR Stage 4 baseline modeling complete. "
@@ -3,7 +3,13 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
-from src.io import load_feature_frame, save_feature_frame
+from src.io import (
+    SchemaMismatchError,
+    load_feature_frame,
+    save_feature_frame,
+    validate_feature_frame,
+    write_feature_frame,
+)
 
 
 def _feature_df() -> pd.DataFrame:
@@ -37,5 +43,16 @@ def test_save_load_feature_frame_roundtrip(tmp_path: Path) -> None:
 def test_save_feature_frame_requires_target_column(tmp_path: Path) -> None:
     bad_df = pd.DataFrame({"date": ["2026-01-01"], "pnl": [10.0]})
 
-    with pytest.raises(ValueError):
+    with pytest.raises(SchemaMismatchError, match="pnl_next_day"):
         save_feature_frame(bad_df, tmp_path / "features.parquet")
+
+
+def test_validate_feature_frame_matches_parquet_roundtrip(tmp_path: Path) -> None:
+    reloaded = load_feature_frame(
+        save_feature_frame(_feature_df(), tmp_path / "features.parquet")
+    )
+
+    validated = validate_feature_frame(_feature_df())
+    pd.testing.assert_frame_equal(validated, reloaded)
+    written = write_feature_frame(validated, tmp_path / "written.parquet")
+    pd.testing.assert_frame_equal(load_feature_frame(written), reloaded)
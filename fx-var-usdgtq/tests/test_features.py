@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -93,3 +94,87 @@ def test_train_test_split_time_insufficient_rows() -> None:
     features = build_features(_raw_df(rows=300))
     with pytest.raises(ValueError):
         train_test_split_time(features, test_days=250)
+
+
+def _assert_matches_pandas_reference(features: pd.DataFrame) -> None:
+    reference = clean(_raw_df())
+    reference["return_simple"] = reference["rate"] / reference["rate"].shift(1) - 1.0
+    rolling = reference["return_simple"].rolling(window=5, min_periods=5)
+    reference["roll_mean"] = rolling.mean()
+    reference["roll_vol"] = rolling.std(ddof=0)
+    reference["lag"] = reference["return_simple"].shift(5)
+    reference = reference.set_index("date").loc[features["date"]]
+
+    assert np.allclose(
+        features["roll_mean_return_simple_5"].to_numpy(),
+        reference["roll_mean"],
+        rtol=1e-6,
+    )
+    assert np.allclose(
+        features["roll_vol_return_simple_5"].to_numpy(),
+        reference["roll_vol"],
+        rtol=1e-6,
+    )
+    assert np.allclose(
+        features["return_simple_lag_5"].to_numpy(), reference["lag"], rtol=1e-6
+    )
+
+
+def test_build_features_rolling_and_lags_match_pandas_reference() -> None:
+    _assert_matches_pandas_reference(build_features(_raw_df(), lags=(5,)))
+
+
+@pytest.mark.parametrize("backend", ["bottleneck", "numpy"])
+def test_build_features_fallbacks_match_pandas_reference(
+    monkeypatch: pytest.MonkeyPatch, backend: str
+) -> None:
+    from src import features as features_module
+
+    monkeypatch.setattr(features_module, "_compiled_feature_kernel", None)
+    if backend == "bottleneck":
+        pytest.importorskip("bottleneck")
+    else:
+        monkeypatch.setattr(features_module, "bn", None)
+
+    _assert_matches_pandas_reference(build_features(_raw_df(), lags=(5,)))
+
+
+def test_build_features_uses_float32_returns_and_float64_pnl() -> None:
+    features = build_features(_raw_df())
+
+    assert features["return_simple"].dtype == np.float32
+    assert features["roll_vol_return_simple_60"].dtype == np.float32
+    assert features["pnl"].dtype == np.float64
+    assert features[TARGET_COLUMN].dtype == np.float64
+
+
+def test_build_features_is_weekend_matches_calendar() -> None:
+    features = build_features(_raw_df())
+    expected = (features["date"].dt.dayofweek >= 5).astype(int)
+
+    assert features["is_weekend"].tolist() == expected.tolist()
+
+
+def test_fused_feature_kernel_matches_numpy_rolling() -> None:
+    pytest.importorskip("numba")
+    from src import features as features_module
+
+    rng = np.random.default_rng(7)
+    rates = 7.5 * np.exp(np.cumsum(rng.normal(0.0, 0.003, size=400)))
+    lags = (1, 5, 60, 500)
+
+    _, return_log, pnl, roll_mean, roll_std = features_module._compiled_feature_kernel(
+        rates, np.asarray(lags, dtype=np.int64), 10000.0
+    )
+    return_simple = np.append(np.nan, rates[1:] / rates[:-1] - 1.0)
+
+    assert np.allclose(pnl, 10000.0 * return_simple, equal_nan=True)
+    assert np.allclose(return_log, np.log1p(return_simple), equal_nan=True)
+    for position, lag in enumerate(lags):
+        series = pd.Series(return_simple)
+        expected_mean = series.rolling(window=lag, min_periods=lag).mean()
+        expected_std = series.rolling(window=lag, min_periods=lag).std(ddof=0)
+        assert np.allclose(roll_mean[position], expected_mean, equal_nan=True)
+        assert np.allclose(
+            roll_std[position], expected_std, rtol=1e-9, atol=1e-15, equal_nan=True
+        )
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import urllib.error
 import urllib.request
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
 import src.io as io
@@ -63,6 +67,13 @@ def _soap_fault_xml(message: str) -> bytes:
     return xml.encode("utf-8")
 
 
+@pytest.fixture(autouse=True)
+def _isolated_soap_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    cache_dir = tmp_path / "soap_cache"
+    monkeypatch.setattr(io, "SOAP_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
 def test_load_raw_missing_file_has_actionable_message(tmp_path: Path) -> None:
     missing_path = tmp_path / "usd_gtq_daily.csv"
 
@@ -101,26 +112,28 @@ def test_download_data_parses_banguat_xml(monkeypatch: pytest.MonkeyPatch) -> No
 def test_download_data_chunks_and_combines_ranges(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    payloads = [
-        _soap_response_xml(
+    payload_by_date = {
+        "31/12/2025": _soap_response_xml(
             [
                 ("31/12/2025", "7.70000", "7.60000"),
                 ("01/01/2026", "7.50000", "7.60000"),
             ]
         ),
-        _soap_response_xml(
+        "01/01/2026": _soap_response_xml(
             [
                 ("01/01/2026", "7.80000", "7.60000"),
                 ("02/01/2026", "7.90000", "7.60000"),
             ]
         ),
-    ]
+    }
 
     call_count = {"count": 0}
 
-    def fake_urlopen(_: urllib.request.Request, timeout: int) -> _FakeResponse:
+    def fake_urlopen(request: urllib.request.Request, timeout: int) -> _FakeResponse:
         call_count["count"] += 1
-        return _FakeResponse(payloads.pop(0))
+        body = request.data.decode("utf-8")
+        start_date = body.split("<fechainit>")[1].split("</fechainit>")[0]
+        return _FakeResponse(payload_by_date[start_date])
 
     monkeypatch.setattr(io.urllib.request, "urlopen", fake_urlopen)
     df = io.download_data("2025-12-31", "2026-01-02")
@@ -251,6 +264,9 @@ def test_save_raw_snapshot_enforces_strict_schema(
     assert output_path.exists()
     assert output_path.read_text(encoding="utf-8").splitlines()[0] == "date,rate"
     assert metadata_path.exists()
+    metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    expected_sha256 = hashlib.sha256(output_path.read_bytes()).hexdigest()
+    assert metadata["sha256"] == expected_sha256
 
 
 def test_load_raw_strict_schema_and_dtypes(tmp_path: Path) -> None:
@@ -272,3 +288,159 @@ def test_load_raw_strict_schema_and_dtypes(tmp_path: Path) -> None:
         "2026-01-02",
     ]
     assert loaded["rate"].tolist() == [7.6, 7.7]
+
+
+def test_download_data_reuses_cached_historical_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+    _isolated_soap_cache: Path,
+) -> None:
+    payload = _soap_response_xml([("02/01/2020", "7.70000", "7.60000")])
+    calls = {"count": 0}
+
+    def fake_urlopen(_: urllib.request.Request, timeout: int) -> _FakeResponse:
+        calls["count"] += 1
+        return _FakeResponse(payload)
+
+    monkeypatch.setattr(io.urllib.request, "urlopen", fake_urlopen)
+    first = io.download_data("2020-01-01", "2020-01-31")
+    second = io.download_data("2020-01-01", "2020-01-31")
+
+    assert calls["count"] == 1
+    assert len(list(_isolated_soap_cache.glob("*.xml"))) == 1
+    assert first["rate"].tolist() == second["rate"].tolist() == [7.7]
+
+
+def test_load_raw_rejects_invalid_types(tmp_path: Path) -> None:
+    bad_rate_path = tmp_path / "bad_rate.csv"
+    bad_rate_path.write_text("date,rate\n2026-01-01,abc\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        io.load_raw(bad_rate_path)
+
+    bad_date_path = tmp_path / "bad_date.csv"
+    bad_date_path.write_text("date,rate\nnot-a-date,7.6\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        io.load_raw(bad_date_path)
+
+
+def test_compute_sha256_is_memoized_until_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    file_path = tmp_path / "snapshot.csv"
+    file_path.write_bytes(b"date,rate\n2026-01-01,7.6\n")
+    monkeypatch.setattr(io, "_HASH_CACHE", {})
+
+    first = io._compute_sha256(file_path)
+    assert len(io._HASH_CACHE) == 1
+    assert io._compute_sha256(file_path) == first
+
+    file_path.write_bytes(b"date,rate\n2026-01-01,7.75\n")
+    second = io._compute_sha256(file_path)
+
+    assert second != first
+    assert second == hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+def test_download_data_rejects_invalid_fecha_and_venta(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for fecha, venta in (("31/02/2026", "7.60000"), ("02/01/2026", "n/a")):
+        payload = _soap_response_xml([(fecha, venta, "7.60000")])
+        monkeypatch.setattr(
+            io.urllib.request,
+            "urlopen",
+            lambda _, timeout, payload=payload: _FakeResponse(payload),
+        )
+        with pytest.raises(RuntimeError) as exc_info:
+            io.download_data("2026-01-01", "2026-01-10")
+        assert "2026-01-01" in str(exc_info.value)
+
+    payload = _soap_response_xml(
+        [
+            ("02/01/2026", "7.6", "7.6"),
+            ("31/02/2026", "7.6", "7.6"),
+            ("x", "7.6", "7.6"),
+        ]
+    )
+    monkeypatch.setattr(
+        io.urllib.request, "urlopen", lambda _, timeout: _FakeResponse(payload)
+    )
+    with pytest.raises(RuntimeError, match="fecha '31/02/2026'"):
+        io.download_data("2026-01-01", "2026-01-10")
+
+
+def test_download_data_accepts_unpadded_fecha(monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = _soap_response_xml(
+        [
+            ("1/02/2026", "7.1", "7.0"),
+            ("03/2/2026", "7.2", "7.0"),
+            ("4/2/2026", "7.3", "7.0"),
+        ]
+    )
+    monkeypatch.setattr(
+        io.urllib.request, "urlopen", lambda _, timeout: _FakeResponse(payload)
+    )
+
+    df = io.download_data("2026-02-01", "2026-02-04")
+
+    assert df["date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2026-02-01",
+        "2026-02-03",
+        "2026-02-04",
+    ]
+
+
+def test_download_data_allow_empty_returns_strict_empty_frame(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    payload = _soap_response_xml([])
+    monkeypatch.setattr(
+        io.urllib.request, "urlopen", lambda _, timeout: _FakeResponse(payload)
+    )
+
+    with pytest.raises(RuntimeError):
+        io.download_data("2026-01-01", "2026-01-02")
+    df = io.download_data("2026-01-01", "2026-01-02", allow_empty=True)
+
+    assert list(df.columns) == ["date", "rate"]
+    assert df.empty
+
+
+def test_save_load_raw_snapshot_parquet_roundtrip(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    metadata_path = tmp_path / "usd_gtq_daily.metadata.json"
+    monkeypatch.setattr(io, "RAW_METADATA_FILE", metadata_path)
+    df = pd.DataFrame({"date": ["2026-01-02", "2026-01-01"], "rate": [7.7, 7.6]})
+
+    output_path = io.save_raw_snapshot(df, tmp_path / "usd_gtq_daily.parquet")
+    loaded = io.load_raw(output_path)
+
+    assert pq.ParquetFile(output_path).metadata.row_group(0).column(0).compression == (
+        "SNAPPY"
+    )
+    assert loaded["date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2026-01-01",
+        "2026-01-02",
+    ]
+    assert loaded["rate"].tolist() == [7.6, 7.7]
+    metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    assert metadata["sha256"] == hashlib.sha256(output_path.read_bytes()).hexdigest()
+
+
+def test_save_predictions_csv_writes_iso_dates_and_plain_header(
+    tmp_path: Path,
+) -> None:
+    output_path = tmp_path / "reports" / "predictions.csv"
+    io.save_predictions_csv(
+        {
+            "date": pd.to_datetime(["2026-01-01", "2026-01-02"]).to_numpy(),
+            "pnl_next_day": np.array([1.5, -2.25]),
+        },
+        output_path,
+    )
+
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "date,pnl_next_day",
+        "2026-01-01,1.5",
+        "2026-01-02,-2.25",
+    ]
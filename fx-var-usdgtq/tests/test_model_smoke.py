@@ -1,12 +1,18 @@
+import subprocess
+import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from src.model import (
     load_model,
+    predict_linear_batch,
     predict_linear_mean,
     predict_quantile_linear,
     predict_quantile_tree,
+    predict_quantile_tree_values,
     save_model,
     train_linear_mean,
     train_quantile_linear,
@@ -48,6 +54,20 @@ def test_train_quantile_tree_returns_model_and_predictions() -> None:
     assert not preds.isna().any()
 
 
+def test_predict_quantile_tree_values_matches_series() -> None:
+    X, y = _train_data()
+    model = train_quantile_tree(X, y)
+    X_test = X.tail(50)
+
+    values = predict_quantile_tree_values(model, X_test)
+
+    assert isinstance(values, np.ndarray)
+    assert values.dtype == np.float64
+    np.testing.assert_array_equal(
+        values, predict_quantile_tree(model, X_test).to_numpy()
+    )
+
+
 def test_train_linear_mean_returns_model_and_predictions() -> None:
     X, y = _train_data()
     model = train_linear_mean(X, y)
@@ -90,3 +110,81 @@ def test_save_load_model_roundtrip(tmp_path: Path) -> None:
     assert model_path.exists()
     assert len(preds) == 10
     assert not preds.isna().any()
+
+
+def test_save_load_linear_model_uses_onnx_export(tmp_path: Path) -> None:
+    pytest.importorskip("skl2onnx")
+    pytest.importorskip("onnxruntime")
+    X, y = _train_data()
+    model = train_quantile_linear(X, y)
+    model_path = tmp_path / "qr_linear_q01.joblib"
+
+    save_model(model, model_path)
+    loaded_model = load_model(model_path)
+    preds = predict_quantile_linear(loaded_model, X.tail(10))
+
+    assert model_path.exists()
+    assert model_path.with_suffix(".onnx").exists()
+    assert np.allclose(preds.to_numpy(), model.predict(X.tail(10)))
+
+
+def test_save_model_skips_onnx_for_tree_model(tmp_path: Path) -> None:
+    X, y = _train_data()
+    model = train_quantile_tree(X, y)
+    model_path = tmp_path / "qr_tree_q01.joblib"
+
+    save_model(model, model_path)
+
+    assert model_path.exists()
+    assert not model_path.with_suffix(".onnx").exists()
+
+
+def test_save_model_keeps_joblib_when_onnx_conversion_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    skl2onnx = pytest.importorskip("skl2onnx")
+
+    def fail_conversion(*args, **kwargs):
+        raise RuntimeError("unsupported operator")
+
+    monkeypatch.setattr(skl2onnx, "convert_sklearn", fail_conversion)
+    X, y = _train_data()
+    model = train_linear_mean(X, y)
+    model_path = tmp_path / "linear_mean.joblib"
+    model_path.with_suffix(".onnx").write_bytes(b"stale")
+
+    save_model(model, model_path)
+
+    assert not model_path.with_suffix(".onnx").exists()
+    assert np.allclose(
+        load_model(model_path).predict(X.tail(5)), model.predict(X.tail(5))
+    )
+
+
+def test_importing_model_module_does_not_load_onnx_packages() -> None:
+    code = (
+        "import sys, src.model, src.pipeline; "
+        "print(sorted({'skl2onnx', 'onnxruntime'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_predict_linear_batch_matches_individual_predictions() -> None:
+    X, y = _train_data()
+    X_test = X.tail(25)
+    m1 = train_quantile_linear(X, y)
+    m3 = train_linear_mean(X, y)
+
+    batched = predict_linear_batch([m1, m3], X_test.to_numpy())
+
+    assert batched.shape == (25, 2)
+    assert np.allclose(batched[:, 0], predict_quantile_linear(m1, X_test))
+    assert np.allclose(batched[:, 1], predict_linear_mean(m3, X_test))
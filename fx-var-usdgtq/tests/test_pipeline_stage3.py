@@ -1,9 +1,12 @@
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pytest
 
 import src.io as io
 import src.pipeline as pipeline
+from src.model import load_model_bundle
 
 
 def _sample_raw_df(rows: int = 700) -> pd.DataFrame:
@@ -16,7 +19,7 @@ def _sample_raw_df(rows: int = 700) -> pd.DataFrame:
 
 
 def _patch_stage4_paths(monkeypatch, tmp_path: Path) -> tuple[Path, Path, Path]:
-    raw_path = tmp_path / "usd_gtq_daily.csv"
+    raw_path = tmp_path / "usd_gtq_daily.parquet"
     metadata_path = tmp_path / "usd_gtq_daily.metadata.json"
     predictions_path = tmp_path / "reports" / "fx-var_usdgtq_predictions.csv"
     model_dir = tmp_path / "models"
@@ -24,6 +27,9 @@ def _patch_stage4_paths(monkeypatch, tmp_path: Path) -> tuple[Path, Path, Path]:
     monkeypatch.setattr(io, "RAW_METADATA_FILE", metadata_path)
     monkeypatch.setattr(pipeline, "MODEL_DIR", model_dir)
     monkeypatch.setattr(pipeline, "PREDICTIONS_FILE", predictions_path)
+    monkeypatch.setattr(
+        pipeline, "DEFAULT_FEATURES_FILE", tmp_path / "features.parquet"
+    )
     return raw_path, metadata_path, predictions_path
 
 
@@ -77,9 +83,8 @@ def test_pipeline_stage4_saves_all_model_files(monkeypatch, tmp_path: Path) -> N
 
     pipeline.run()
 
-    assert (model_dir / "qr_linear_q01.joblib").exists()
-    assert (model_dir / "qr_tree_q01.joblib").exists()
-    assert (model_dir / "linear_mean.joblib").exists()
+    bundle = load_model_bundle(model_dir / "stage4_models.joblib")
+    assert set(bundle) == {"qr_linear", "qr_tree", "linear_mean"}
 
 
 def test_pipeline_stage4_uses_fixed_250_day_test_window(
@@ -107,3 +112,156 @@ def test_pipeline_stage4_uses_fixed_250_day_test_window(
     stdout = capsys.readouterr().out
     assert len(output) == 250
     assert "STAGE4_MODELS" in stdout
+    assert f"test_min_date={output['date'].min()}" in stdout
+    assert f"test_max_date={output['date'].max()}" in stdout
+
+
+def test_pipeline_stage4_reuses_raw_snapshot_covered_by_metadata(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    raw_path, _, predictions_path = _patch_stage4_paths(monkeypatch, tmp_path)
+    monkeypatch.setattr(io, "DEFAULT_RAW_FILE", raw_path)
+
+    monkeypatch.setattr(pipeline, "download_data", _sample_raw_df)
+    monkeypatch.setattr(
+        pipeline,
+        "save_raw_snapshot",
+        lambda df: io.save_raw_snapshot(df, raw_path),
+    )
+    monkeypatch.setattr(
+        pipeline,
+        "load_raw",
+        lambda path=None: io.load_raw(raw_path if path is None else path),
+    )
+    pipeline.run()
+    snapshot_bytes = raw_path.read_bytes()
+
+    def fail_download(*args, **kwargs) -> pd.DataFrame:
+        raise AssertionError("download_data must not be called on a cache hit")
+
+    monkeypatch.setattr(pipeline, "download_data", fail_download)
+    pipeline.run()
+
+    assert raw_path.read_bytes() == snapshot_bytes
+    assert len(pd.read_csv(predictions_path)) == 250
+
+
+def test_pipeline_stage4_reuses_cached_models_for_same_raw_snapshot(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    raw_path, _, predictions_path = _patch_stage4_paths(monkeypatch, tmp_path)
+
+    monkeypatch.setattr(pipeline, "download_data", _sample_raw_df)
+    monkeypatch.setattr(
+        pipeline,
+        "save_raw_snapshot",
+        lambda df: io.save_raw_snapshot(df, raw_path),
+    )
+    monkeypatch.setattr(
+        pipeline,
+        "load_raw",
+        lambda path=None: io.load_raw(raw_path if path is None else path),
+    )
+    pipeline.run()
+    first_output = pd.read_csv(predictions_path)
+
+    def fail_training(*args, **kwargs):
+        raise AssertionError("models must come from the cache")
+
+    for name in ("train_quantile_linear", "train_quantile_tree", "train_linear_mean"):
+        monkeypatch.setattr(pipeline, name, fail_training)
+    pipeline.run()
+
+    pd.testing.assert_frame_equal(pd.read_csv(predictions_path), first_output)
+    with pytest.raises(RuntimeError):
+        pipeline.run(force_refresh=True)
+
+
+def test_pipeline_stage4_rewrites_missing_features_on_cache_hit(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    raw_path, _, _ = _patch_stage4_paths(monkeypatch, tmp_path)
+    features_path = tmp_path / "features.parquet"
+
+    monkeypatch.setattr(pipeline, "download_data", _sample_raw_df)
+    monkeypatch.setattr(
+        pipeline,
+        "save_raw_snapshot",
+        lambda df: io.save_raw_snapshot(df, raw_path),
+    )
+    monkeypatch.setattr(
+        pipeline,
+        "load_raw",
+        lambda path=None: io.load_raw(raw_path if path is None else path),
+    )
+    pipeline.run()
+    first_features = io.load_feature_frame(features_path)
+    features_path.unlink()
+
+    def fail_training(*args, **kwargs):
+        raise AssertionError("models must come from the cache")
+
+    for name in ("train_quantile_linear", "train_quantile_tree", "train_linear_mean"):
+        monkeypatch.setattr(pipeline, name, fail_training)
+    pipeline.run()
+
+    pd.testing.assert_frame_equal(io.load_feature_frame(features_path), first_features)
+
+
+def test_pipeline_stage4_rebuilds_corrupted_model_cache(
+    monkeypatch,
+    tmp_path: Path,
+) -> None:
+    raw_path, _, predictions_path = _patch_stage4_paths(monkeypatch, tmp_path)
+
+    monkeypatch.setattr(pipeline, "download_data", _sample_raw_df)
+    monkeypatch.setattr(
+        pipeline,
+        "save_raw_snapshot",
+        lambda df: io.save_raw_snapshot(df, raw_path),
+    )
+    monkeypatch.setattr(
+        pipeline,
+        "load_raw",
+        lambda path=None: io.load_raw(raw_path if path is None else path),
+    )
+    pipeline.run()
+    (cache_path,) = (tmp_path / "models" / "cache").glob("*.joblib")
+    cache_path.write_bytes(cache_path.read_bytes()[:64])
+
+    pipeline.run()
+
+    assert len(pd.read_csv(predictions_path)) == 250
+    assert set(pipeline._load_stage4_cache(cache_path)) == {"features", "models"}
+    assert not list(cache_path.parent.glob("*.tmp"))
+
+
+def test_build_model_matrix_returns_contiguous_float64_and_rejects_nan() -> None:
+    frame = pd.DataFrame(
+        {"date": ["2026-01-01", "2026-01-02"], "a": [1.0, 2.0], "b": [3, 4]}
+    )
+
+    matrix = pipeline._build_model_matrix(frame)
+
+    assert matrix.dtype == "float64"
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert matrix.tolist() == [[1.0, 3.0], [2.0, 4.0]]
+    with pytest.raises(ValueError):
+        pipeline._build_model_matrix(frame.assign(a=[1.0, None]))
+    assert pipeline._build_model_matrix(frame, ["b"]).tolist() == [[3.0], [4.0]]
+
+
+def test_validate_prediction_matrix_reports_offending_columns() -> None:
+    good = np.array([0.1, 0.2])
+    pipeline._validate_prediction_matrix({"a": good, "b": good}, 2)
+
+    with pytest.raises(ValueError, match="^b, c predictions contain NaN"):
+        pipeline._validate_prediction_matrix(
+            {"a": good, "b": np.array([0.1, np.nan]), "c": np.array([np.nan, 0.2])},
+            2,
+        )
+    with pytest.raises(ValueError, match="length 1 does not match"):
+        pipeline._validate_prediction_matrix({"a": good, "b": good[:1]}, 2)
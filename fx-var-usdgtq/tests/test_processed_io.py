@@ -1,34 +1,88 @@
+import shutil
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import pytest
 
-from src.io import load_processed, save_processed
+from src.io import (
+    PROCESSED_SCHEMA,
+    SchemaMismatchError,
+    load_processed,
+    save_processed,
+)
 
+# Shared read-only inputs; save_processed never mutates the frame it is given.
+_INPUT_DF = pd.DataFrame({"date": ["2026-01-02", "2026-01-01"], "rate": [7.7, 7.6]})
+_BAD_DF = pd.DataFrame({"date": ["2026-01-01"], "rate": [7.6], "extra": [1]})
+
+
+@pytest.fixture(scope="module")
+def roundtrip_parquet(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    output_dir = tmp_path_factory.mktemp("processed")
+    return save_processed(_INPUT_DF, output_dir / "fx_rates.parquet")
 
-def test_save_load_processed_parquet_roundtrip(tmp_path: Path) -> None:
-    input_df = pd.DataFrame(
-        {
-            "date": ["2026-01-02", "2026-01-01"],
-            "rate": [7.7, 7.6],
-        }
-    )
-    output_path = tmp_path / "fx_rates.parquet"
 
-    written_path = save_processed(input_df, output_path)
-    reloaded = load_processed(written_path)
+def test_save_load_processed_parquet_roundtrip(roundtrip_parquet: Path) -> None:
+    reloaded = load_processed(roundtrip_parquet)
 
-    assert written_path.exists()
+    assert roundtrip_parquet.exists()
+    assert not list(roundtrip_parquet.parent.glob("*.tmp"))
     assert list(reloaded.columns) == ["date", "rate"]
-    assert reloaded["date"].dt.strftime("%Y-%m-%d").tolist() == [
-        "2026-01-01",
-        "2026-01-02",
-    ]
+    np.testing.assert_array_equal(
+        reloaded["date"].to_numpy().astype("datetime64[D]"),
+        np.array(["2026-01-01", "2026-01-02"], dtype="datetime64[D]"),
+    )
     assert reloaded["rate"].tolist() == [7.6, 7.7]
+    assert _INPUT_DF["date"].tolist() == ["2026-01-02", "2026-01-01"]
 
 
 def test_save_processed_enforces_strict_schema(tmp_path: Path) -> None:
-    bad_df = pd.DataFrame({"date": ["2026-01-01"], "rate": [7.6], "extra": [1]})
+    with pytest.raises(SchemaMismatchError, match="Unexpected: extra"):
+        save_processed(_BAD_DF, tmp_path / "bad.parquet")
+    with pytest.raises(SchemaMismatchError, match="exactly in this order") as exc_info:
+        save_processed(_BAD_DF[["rate", "date"]], tmp_path / "bad.parquet")
+    assert "Missing" not in str(exc_info.value)
+
+
+def test_save_processed_writes_lz4_with_statistics(roundtrip_parquet: Path) -> None:
+    column_meta = pq.ParquetFile(roundtrip_parquet).metadata.row_group(0).column(0)
+
+    assert column_meta.compression == "LZ4"
+    assert column_meta.statistics is not None
+    assert not column_meta.has_dictionary_page
+    assert pq.read_schema(roundtrip_parquet).equals(
+        PROCESSED_SCHEMA, check_metadata=True
+    )
+
+
+def test_save_processed_parses_only_iso_dates(tmp_path: Path) -> None:
+    iso_df = pd.DataFrame({"date": ["2026-01-01", "2026-01-02T00:00:00"], "rate": 7.6})
+    reloaded = load_processed(save_processed(iso_df, tmp_path / "iso.parquet"))
+    assert len(reloaded) == 2
+
+    with pytest.raises(ValueError, match="datetime-like"):
+        save_processed(
+            pd.DataFrame({"date": ["02/01/2026"], "rate": [7.6]}),
+            tmp_path / "ambiguous.parquet",
+        )
+
+
+def test_save_processed_compression_override(tmp_path: Path) -> None:
+    written_path = save_processed(
+        _INPUT_DF, tmp_path / "fx.parquet", compression="zstd"
+    )
+    column_meta = pq.ParquetFile(written_path).metadata.row_group(0).column(0)
+
+    assert column_meta.compression == "ZSTD"
+
+
+def test_save_processed_recreates_deleted_directory(tmp_path: Path) -> None:
+    output_path = tmp_path / "processed" / "fx_rates.parquet"
+    save_processed(_INPUT_DF, output_path)
+    shutil.rmtree(output_path.parent)
+
+    save_processed(_INPUT_DF, output_path)
 
-    with pytest.raises(ValueError):
-        save_processed(bad_df, tmp_path / "bad.parquet")
+    assert len(load_processed(output_path)) == 2